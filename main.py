@@ -1,6 +1,7 @@
 import sys
-from source import configuration, TmdbAPI, email_template, email_controller
+from source import configuration, TmdbAPI, email_template, email_controller, utils
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
 from source.configuration import logging
 from source.configuration_checker import check_configuration
 from apscheduler.schedulers.blocking import BlockingScheduler
@@ -44,18 +45,17 @@ def populate_series_item_from_episode(series_items, item):
             "poster": "https://redthread.uoregon.edu/files/original/affd16fd5264cab9197da4cd1a996f820e601ee4.png"
             # will be populated later, when parsing the series item
         }
-    if item["SeasonName"] not in series_items[item["SeriesName"]]["seasons"]:
-        series_items[item["SeriesName"]]["seasons"].append(item["SeasonName"])
-    series_items[item["SeriesName"]]["episodes"].append(item.get('IndexNumber'))
-    if series_items[item["SeriesName"]]["created_on"] != "undefined" or series_items[item["SeriesName"]][
-        "created_on"] is not None:
+    series_item = series_items[item["SeriesName"]]
+    if item["SeasonName"] not in series_item["seasons"]:
+        series_item["seasons"].append(item["SeasonName"])
+    series_item["episodes"].append(item.get('IndexNumber'))
+    if series_item["created_on"] != "undefined" or series_item["created_on"] is not None:
         try:
-            if dt.datetime.fromisoformat(series_items[item["SeriesName"]]["created_on"]) < dt.datetime.fromisoformat(
-                    item["DateCreated"]):
-                series_items[item["SeriesName"]]["created_on"] = item["DateCreated"]
+            if dt.datetime.fromisoformat(series_item["created_on"]) < dt.datetime.fromisoformat(item["DateCreated"]):
+                series_item["created_on"] = item["DateCreated"]
         except:
             pass
-    series_items[item["SeriesName"]]["created_on"] = item.get("DateCreated", "undefined")
+    series_item["created_on"] = item.get("DateCreated", "undefined")
 
 
 def populate_series_item_with_series_related_information(series_items, watched_tv_folders_id):
@@ -63,9 +63,20 @@ def populate_series_item_with_series_related_information(series_items, watched_t
     populate_series_item_from_episode will populate the series item with the episode information, but it will not include the series information (description, year, poster).
     This function will populate the series item with the series information.
     """
+    if not series_items:
+        # No new episode: nothing to look up, avoid fetching the TV folders
+        return
     for folder_id in watched_tv_folders_id:
+        # Fetch the folder content once and look each series up by name,
+        # instead of fetching the whole folder again for every series.
+        folder_items, _ = ServerAPI.get_item_from_parent(parent_id=folder_id, type="tv")
+        folder_items_by_name = {}
+        for folder_item in folder_items:
+            if "Name" in folder_item.keys():
+                folder_items_by_name.setdefault(folder_item["Name"], folder_item)
+
         for serie_name in series_items.keys():
-            item = ServerAPI.get_item_from_parent_by_name(parent_id=folder_id, name=serie_name)
+            item = folder_items_by_name.get(serie_name)
             if item is not None:
                 series_year = item.get("ProductionYear")
                 if series_year == 0 or series_year is None:
@@ -74,7 +85,8 @@ def populate_series_item_with_series_related_information(series_items, watched_t
                 else:
                     series_year_for_tmdb = series_year
                     series_year_for_display = series_year
-                series_items[item['Name']]["year"] = series_year_for_display
+                series_item = series_items[serie_name]
+                series_item["year"] = series_year_for_display
                 tmdb_id = None
                 if "ProviderIds" in item.keys():
                     if "Tmdb" in item["ProviderIds"].keys():
@@ -93,15 +105,67 @@ def populate_series_item_with_series_related_information(series_items, watched_t
                     if "overview" not in tmdb_info.keys():
                         logging.warning(f"Item {item['Name']} has no overview.")
                         tmdb_info["overview"] = "No overview available."
-                    series_items[item['Name']]["description"] = tmdb_info["overview"]
-                    series_items[item['Name']]["rating"] = f"{tmdb_info.get('vote_average', 0):.1f}/10"
-                    series_items[item['Name']][
-                        "poster"] = f"https://image.tmdb.org/t/p/w500{tmdb_info['poster_path']}" if tmdb_info[
-                        "poster_path"] else "https://redthread.uoregon.edu/files/original/affd16fd5264cab9197da4cd1a996f820e601ee4.png"
+                    poster_path = tmdb_info["poster_path"]
+                    series_item["description"] = tmdb_info["overview"]
+                    series_item["rating"] = f"{tmdb_info.get('vote_average', 0):.1f}/10"
+                    series_item["poster"] = f"https://image.tmdb.org/t/p/w500{poster_path}" if poster_path else "https://redthread.uoregon.edu/files/original/affd16fd5264cab9197da4cd1a996f820e601ee4.png"
             else:
                 logging.warning(f"Item {serie_name} has not been found in server. Skipping.")
 
 
+def build_movie_item(item):
+    """
+    Build the movie item used to build the email content, from a movie returned by the server.
+    Details (description, rating, poster) are fetched from TMDB.
+    """
+    logging.debug(f"Processing movie item: {item}")
+    tmdb_id = None
+    movie_year = item.get("ProductionYear")
+    if movie_year == 0 or movie_year is None:
+        movie_year_for_tmdb = None
+        movie_year_for_display = "N/A"
+    else:
+        movie_year_for_tmdb = movie_year
+        movie_year_for_display = movie_year
+
+    if "DateCreated" not in item.keys():
+        logging.warning(f"Item {item['Name']} has no creation date.")
+        item["DateCreated"] = None
+    if "ProviderIds" in item.keys():
+        if "Tmdb" in item["ProviderIds"].keys():
+            tmdb_id = item["ProviderIds"]["Tmdb"]
+
+    if tmdb_id is not None:  # id provided by server
+        tmdb_info = TmdbAPI.get_media_detail_from_id(id=tmdb_id, type="movie")
+    else:
+        logging.info(f"Item {item['Name']} has no TMDB id, searching by title.")
+        tmdb_info = TmdbAPI.get_media_detail_from_title(title=item["Name"], type="movie",
+                                                        year=movie_year_for_tmdb)
+
+    if tmdb_info is None:
+        logging.warning(f"Item {item['Name']} has not been found on TMDb. Skipping.")
+        return {
+            "year": movie_year_for_display,
+            "created_on": item["DateCreated"],
+            "description": "No description available.",
+            "rating": "N/A",
+            "poster": "https://redthread.uoregon.edu/files/original/affd16fd5264cab9197da4cd1a996f820e601ee4.png"
+        }
+    else:
+        if "overview" not in tmdb_info.keys():
+            logging.warning(f"Item {item['Name']} has no overview.")
+            tmdb_info["overview"] = "No overview available."
+
+        poster_path = tmdb_info["poster_path"]
+        return {
+            "year": movie_year_for_display,
+            "created_on": item["DateCreated"],
+            "description": tmdb_info["overview"],
+            "rating": f"{tmdb_info.get('vote_average', 0):.1f}/10",
+            "poster": f"https://image.tmdb.org/t/p/w500{poster_path}" if poster_path else "https://redthread.uoregon.edu/files/original/affd16fd5264cab9197da4cd1a996f820e601ee4.png"
+        }
+
+
 def send_newsletter():
     logging.info("Sending newsletter ...")
     folders = ServerAPI.get_root_items()
@@ -118,6 +182,13 @@ def send_newsletter():
             logging.warning(
                 f"Folder {item['Name']} is not watched. Skipping. Add \"{item['Name']}\" in your watched folder to include it.")
 
+    # Server statistics do not depend on the new items: fetch them in the background while the new items are processed.
+    # When there is nothing to send, the result of this future (and any exception it raised) is discarded.
+    statistics_executor = ThreadPoolExecutor(max_workers=1)
+    server_statistics = statistics_executor.submit(ServerAPI.get_server_statistics, watched_film_folders_id,
+                                                   watched_tv_folders_id)
+    statistics_executor.shutdown(wait=False)
+
     total_movie = 0
     total_tv = 0
     movie_items = {}
@@ -128,53 +199,10 @@ def send_newsletter():
                                                             minimum_creation_date=dt.datetime.now() - dt.timedelta(
                                                                 days=configuration.conf.server.observed_period_days))
         total_movie += total_count
-        for item in items:
-            logging.debug(f"Processing movie item: {item}")
-            tmdb_id = None
-            movie_year = item.get("ProductionYear")
-            if movie_year == 0 or movie_year is None:
-                movie_year_for_tmdb = None
-                movie_year_for_display = "N/A"
-            else:
-                movie_year_for_tmdb = movie_year
-                movie_year_for_display = movie_year
-
-            if "DateCreated" not in item.keys():
-                logging.warning(f"Item {item['Name']} has no creation date.")
-                item["DateCreated"] = None
-            if "ProviderIds" in item.keys():
-                if "Tmdb" in item["ProviderIds"].keys():
-                    tmdb_id = item["ProviderIds"]["Tmdb"]
-
-            if tmdb_id is not None:  # id provided by server
-                tmdb_info = TmdbAPI.get_media_detail_from_id(id=tmdb_id, type="movie")
-            else:
-                logging.info(f"Item {item['Name']} has no TMDB id, searching by title.")
-                tmdb_info = TmdbAPI.get_media_detail_from_title(title=item["Name"], type="movie",
-                                                                year=movie_year_for_tmdb)
-
-            if tmdb_info is None:
-                logging.warning(f"Item {item['Name']} has not been found on TMDb. Skipping.")
-                movie_items[item["Name"]] = {
-                    "year": movie_year_for_display,
-                    "created_on": item["DateCreated"],
-                    "description": "No description available.",
-                    "rating": "N/A",
-                    "poster": "https://redthread.uoregon.edu/files/original/affd16fd5264cab9197da4cd1a996f820e601ee4.png"
-                }
-            else:
-                if "overview" not in tmdb_info.keys():
-                    logging.warning(f"Item {item['Name']} has no overview.")
-                    tmdb_info["overview"] = "No overview available."
-
-                movie_items[item["Name"]] = {
-                    "year": movie_year_for_display,
-                    "created_on": item["DateCreated"],
-                    "description": tmdb_info["overview"],
-                    "rating": f"{tmdb_info.get('vote_average', 0):.1f}/10",
-                    "poster": f"https://image.tmdb.org/t/p/w500{tmdb_info['poster_path']}" if tmdb_info[
-                        "poster_path"] else "https://redthread.uoregon.edu/files/original/affd16fd5264cab9197da4cd1a996f820e601ee4.png"
-                }
+        # Each movie needs its own TMDB request. They are independent, so run them concurrently.
+        with ThreadPoolExecutor(max_workers=utils.MAX_CONCURRENT_REQUESTS) as executor:
+            for item, movie_item in zip(items, executor.map(build_movie_item, items)):
+                movie_items[item["Name"]] = movie_item
 
     for folder_id in watched_tv_folders_id:
         items, total_count = ServerAPI.get_item_from_parent(parent_id=folder_id, type="tv",
@@ -189,7 +217,7 @@ def send_newsletter():
                                                          watched_tv_folders_id=watched_tv_folders_id)
     logging.debug("Series populated : " + str(series_items))
     if len(movie_items) + len(series_items) > 0:
-        total_movies_on_server, total_tv_on_server = ServerAPI.get_server_statistics(watched_film_folders_id, watched_tv_folders_id)
+        total_movies_on_server, total_tv_on_server = server_statistics.result()
         template = email_template.populate_email_template(movies=movie_items, series=series_items, total_tv=total_tv,
                                                           total_movie=total_movie, total_movies_on_server=total_movies_on_server, total_tv_on_server=total_tv_on_server)
 
@@ -1,13 +1,18 @@
 from source.configuration import conf, logging
-import requests
+from source import utils
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+# Shared by all the requests to the server, to reuse its connections
+session = utils.create_http_session()
 
 def get_root_items():
     headers = {
         "Authorization": f'MediaBrowser Token="{conf.jellyfin.api_token}"'
     }
 
-    response = requests.get(f'{conf.jellyfin.url}/Items', headers=headers)
+    response = session.get(f'{conf.jellyfin.url}/Items', headers=headers)
     if response.status_code != 200:
         logging.error(f"Error while getting the root items, status code: {response.status_code}.")
         raise Exception(f"Error while getting the root items, status code: {response.status_code}. Answer: {response.text}.")
@@ -23,60 +28,47 @@ def get_item_from_parent(parent_id, type, minimum_creation_date=None):
 
 
 
-    response = requests.get(f'{conf.jellyfin.url}/Items?ParentId={parent_id}&fields=DateCreated,ProviderIds&Recursive=true', headers=headers)
+    response = session.get(f'{conf.jellyfin.url}/Items?ParentId={parent_id}&fields=DateCreated,ProviderIds&Recursive=true', headers=headers)
     if response.status_code != 200:
         logging.error(f"Error while getting the items from parent, status code: {response.status_code}.")
         raise Exception(f"Error while getting the items from parent, status code: {response.status_code}. Answer: {response.text}.")
+    # Parse the body once, it contains the whole recursive content of the folder
+    content = response.json()
     if not minimum_creation_date:
-        return response.json()["Items"], response.json()["TotalRecordCount"]
+        return content["Items"], content["TotalRecordCount"]
     else:
         recent_items = []
-        for item in response.json()["Items"]:
+        for item in content["Items"]:
             if (item.get("Type") == "Episode" and item.get("LocationType") == "Virtual") or (item.get("Type") == "Movie" and item.get("LocationType") == "Virtual"):
                 # see https://github.com/SeaweedbrainCY/jellyfin-newsletter/issues/28 for context
                 logging.debug(f"Skipping item {item['Name']} because it is a virtual item. Item : {item}")
                 continue
-            creation_date = dt.datetime.strptime(item["DateCreated"].split("T")[0], "%Y-%m-%d")
+            creation_date = dt.datetime.strptime(item["DateCreated"][:10], "%Y-%m-%d")
             if creation_date > minimum_creation_date:
                 logging.debug(f"Item {item['Name']} is more recent than {minimum_creation_date} (added on {creation_date}). Adding it to the list.")
                 logging.debug("Item details: " + str(item))
                 recent_items.append(item)
-        return recent_items, response.json()["TotalRecordCount"]
+        return recent_items, content["TotalRecordCount"]
 
 
-def get_item_from_parent_by_name(parent_id, name):
+def get_folder_item_count(folder_id, item_type):
+    """
+    Return the number of items of the given type (e.g. Movie, Series) in a folder, or 0 if the request failed.
+    """
     headers = {
         "Authorization": f'MediaBrowser Token="{conf.jellyfin.api_token}"'
     }
-    response = requests.get(f'{conf.jellyfin.url}/Items?ParentId={parent_id}&fields=DateCreated,ProviderIds&Recursive=true', headers=headers)
+    # Only TotalRecordCount is needed: ask for a single item rather than the whole content of the folder
+    response = session.get(f'{conf.jellyfin.url}/Items?ParentId={folder_id}&IncludeItemTypes={item_type}&Recursive=true&Limit=1&EnableTotalRecordCount=true', headers=headers)
     if response.status_code != 200:
-        logging.error(f"Error while getting the items from parent, status code: {response.status_code}.")
-        raise Exception(f"Error while getting the items from parent, status code: {response.status_code}. Answer: {response.text}.")
-    for item in response.json()["Items"]:
-        if "Name" in item.keys():
-            if item["Name"] == name:
-                return item
+        logging.error(f"Error getting {item_type.lower()} count for folder {folder_id}: {response.status_code}")
+        return 0
+    return response.json()['TotalRecordCount']
 
 
 def get_server_statistics(watched_film_folders_id, watched_tv_folders_id):
-    headers = {
-        "Authorization": f'MediaBrowser Token="{conf.jellyfin.api_token}"'
-    }
-    
-    total_movies = 0
-    for folder_id in watched_film_folders_id:
-        response = requests.get(f'{conf.jellyfin.url}/Items?ParentId={folder_id}&IncludeItemTypes=Movie&Recursive=true', headers=headers)
-        if response.status_code == 200:
-            total_movies += response.json()['TotalRecordCount']
-        else:
-            logging.error(f"Error getting movie count for folder {folder_id}: {response.status_code}")
-
-    total_series = 0
-    for folder_id in watched_tv_folders_id:
-        response = requests.get(f'{conf.jellyfin.url}/Items?ParentId={folder_id}&IncludeItemTypes=Series&Recursive=true', headers=headers)
-        if response.status_code == 200:
-            total_series += response.json()['TotalRecordCount']
-        else:
-            logging.error(f"Error getting series count for folder {folder_id}: {response.status_code}")
-            
-    return total_movies, total_series
+    # One request per folder, all independent: run them concurrently
+    with ThreadPoolExecutor(max_workers=utils.MAX_CONCURRENT_REQUESTS) as executor:
+        movie_counts = executor.map(get_folder_item_count, watched_film_folders_id, repeat("Movie"))
+        series_counts = executor.map(get_folder_item_count, watched_tv_folders_id, repeat("Series"))
+        return sum(movie_counts), sum(series_counts)
@@ -1,8 +1,14 @@
-import requests
-from source import configuration 
+from source import configuration, utils
 import json
 from source.configuration import logging
 
+# Shared by all the requests to TMDB, to reuse the connection between lookups
+session = utils.create_http_session()
+
+# TMDB language code of each email template language, one entry per language of email_template.translation
+tmdb_languages = {
+    "en": "en-us",
+}
 
 
 def get_media_detail_from_title(title, type, year=None):
@@ -10,11 +16,7 @@ def get_media_detail_from_title(title, type, year=None):
     if type not in ["movie", "tv"]:
         logging.error(f"Error while retrieving a media from TMDB. Type must be 'movie' or 'tv'. Got {type}")
         return None
-    lang = "en-us" 
-    if configuration.conf.email_template.language == "fr":
-        lang = "fr-fr"
-    else:
-        lang = "en-us"
+    lang = tmdb_languages[configuration.conf.email_template.language]
     url = f"https://api.themoviedb.org/3/search/{type}?query={title}&language={lang}{year_query}"
 
     headers = {
@@ -22,17 +24,18 @@ def get_media_detail_from_title(title, type, year=None):
         "Authorization": f"Bearer {configuration.conf.tmdb.api_key}"
     }
 
-    response = requests.get(url, headers=headers)
+    response = session.get(url, headers=headers)
     if response.status_code != 200:
         logging.error(f"Error while getting media detail from title, status code: {response.status_code}.")
         raise Exception(f"Error while getting the token, status code: {response.status_code}. Answer: {response.text}.")
-    if response.json()["total_results"] == 1:
-        return response.json()["results"][0]
-    elif response.json()["total_results"] > 1:
+    search_results = response.json()
+    if search_results["total_results"] == 1:
+        return search_results["results"][0]
+    elif search_results["total_results"] > 1:
         logging.warning(f"Warning, multiple results found for the title {title}. Selecting the best one based on popularity.")
         max_popularity = 0
         best_result = None
-        for result in response.json()["results"]:
+        for result in search_results["results"]:
             if result["popularity"] > max_popularity:
                 max_popularity = result["popularity"]
                 best_result = result
@@ -47,18 +50,14 @@ def get_media_detail_from_id(id, type):
     if type not in ["movie", "tv"]:
         logging.error(f"Error while retrieving a media from TMDB. Type must be 'movie' or 'tv'. Got {type}")
         return None
-    lang = "en-us" 
-    if configuration.conf.email_template.language == "fr":
-        lang = "fr-fr"
-    else:
-        lang = "en-us"
+    lang = tmdb_languages[configuration.conf.email_template.language]
     url= f"https://api.themoviedb.org/3/{type}/{id}?language={lang}"
     headers = {
         "accept": "application/json",
         "Authorization": f"Bearer {configuration.conf.tmdb.api_key}"
     }
 
-    response = requests.get(url, headers=headers)
+    response = session.get(url, headers=headers)
     if response.status_code != 200:
         logging.error(f"Error while getting media detail from id, status code: {response.status_code}.")
         raise Exception(f"Error while getting media detail from id, status code: {response.status_code}. Answer: {response.text}.")
@@ -130,7 +130,8 @@ class Config:
 try:
     with open("./config/config.yml") as config_yml:
         try:
-            raw_conf = yaml.safe_load(config_yml)
+            # Use the LibYAML based loader when PyYAML has been built with it, it is much faster than the pure Python one
+            raw_conf = yaml.load(config_yml, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
             conf = Config(raw_conf)
 
         except yaml.YAMLError as exc:
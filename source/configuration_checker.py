@@ -1,5 +1,6 @@
 from source.configuration import conf
 from source.configuration import logging
+from source.email_template import translation
 import re
 from urllib.parse import urlparse
 
@@ -39,8 +40,8 @@ def email_template_configuration():
     # Language
     assert isinstance(conf.email_template.language,
                       str), "[FATAL] Invalid email template language. The language must be a string. Please check the configuration."
-    assert conf.email_template.language in ['en',
-                                            'fr'], "[FATAL] Invalid email template language. The language must be either 'en' or 'fr'. Please check the configuration."
+    # Checked once here, so the email template can use the language without checking it at each newsletter
+    assert conf.email_template.language in translation, f"[FATAL] Invalid email template language. The language must be one of {', '.join(translation)}. Please check the configuration."
 
     # Subject
     assert isinstance(conf.email_template.subject,
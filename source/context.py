@@ -16,11 +16,14 @@ class SafeFormatDict(dict):
     def __missing__(self, key): 
         return key.join("{}")
 
+# Locale of each email template language, used to format dates, one entry per language of email_template.translation
+locales = {
+    "en": 'en_US.UTF-8',
+}
+
 # Set locale to the user's locale
-if configuration.conf.email_template.language == "fr":
-    locale.setlocale(locale.LC_TIME, 'fr_FR.UTF-8')
-else:
-    locale.setlocale(locale.LC_TIME, 'en_US.UTF-8')
+# This module is imported before check_configuration validates the language, hence the fallback
+locale.setlocale(locale.LC_TIME, locales.get(configuration.conf.email_template.language, 'en_US.UTF-8'))
 
 placeholders = SafeFormatDict({
     "date": dt.datetime.now().strftime("%Y-%m-%d"),
@@ -16,18 +16,22 @@ def send_email(html_content):
     except Exception as e:
         raise Exception(f"Error while connecting to the SMTP server. Got error : {e}")
 
-    for recipient in configuration.conf.recipients:
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = f"{configuration.conf.email_template.subject} for {context.placeholders['day_name']}"
-        msg['From'] = configuration.conf.email.smtp_sender_email
-        msg['To'] = recipient
+    # The message is the same for every recipient, only the To header changes.
+    # Build it (and encode the HTML body) once instead of once per recipient.
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = f"{configuration.conf.email_template.subject} for {context.placeholders['day_name']}"
+    msg['From'] = configuration.conf.email.smtp_sender_email
+
+    # Add both plain text and HTML parts
+    text_part = MIMEText("Please view this email in an HTML-capable email client.", 'plain')
+    html_part = MIMEText(html_content, 'html', 'utf-8')
 
-        # Add both plain text and HTML parts
-        text_part = MIMEText("Please view this email in an HTML-capable email client.", 'plain')
-        html_part = MIMEText(html_content, 'html', 'utf-8')
+    msg.attach(text_part)
+    msg.attach(html_part)
 
-        msg.attach(text_part)
-        msg.attach(html_part)
+    for recipient in configuration.conf.recipients:
+        del msg['To']
+        msg['To'] = recipient
 
         smtp_server.sendmail(configuration.conf.email.smtp_sender_email, recipient, msg.as_string())
         logging.info(f"Email sent to {recipient}")
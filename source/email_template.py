@@ -1,4 +1,6 @@
 from source import configuration, context, utils
+import functools
+import html
 import re
 
 translation = {
@@ -16,6 +18,80 @@ translation = {
     }
 }
 
+# Markup of a movie or TV show card, filled with str.format_map for each new item
+MEDIA_CARD = """
+        <div class="media-item">
+            <!--[if mso]><table role="presentation" border="0" cellpadding="0" cellspacing="0" width="100%"><tr><td width="25%" valign="top"><![endif]-->
+            <div class="column">
+                <img src="{poster}" alt="{title}" style="width: 100%; height: auto; display: block; margin: 0 auto;" />
+            </div>
+            <!--[if mso]></td><td width="70%" valign="top"><![endif]-->
+            <div class="column content">
+                <div class="media-content">
+                    <h3 class="media-title">{heading}</h3>
+                    <div class="media-meta">{added_on} {added_date}</div>
+                    <p class="media-description">{description}</p>{details}
+                    <p class="media-rating">Rating: {rating}</p>
+                </div>
+            </div>
+            <!--[if mso]></td></tr></table><![endif]-->
+        </div>
+        """
+
+# Extra lines of a TV show card, listing the added seasons and episodes
+SERIES_DETAILS = """
+                    <div class="media-meta">{added_items}</div>
+                    <br>"""
+
+# Matches a ${key} placeholder, the key being captured in group 1
+PLACEHOLDER_PATTERN = re.compile(r"\$\{(\w+)\}")
+
+
+def substitute_placeholders(template, values) -> str:
+    """
+    Replace every ${key} placeholder of the template by values[key], in a single pass over the template.
+    Placeholders without a value are left untouched.
+    """
+    return PLACEHOLDER_PATTERN.sub(lambda match: values.get(match.group(1), match.group(0)), template)
+
+
+@functools.lru_cache(maxsize=1)
+def load_template() -> str:
+    """
+    Read the email template from disk.
+    The template does not change while the program is running, so it is read once and kept in memory.
+    """
+    with open("./template/new_media_notification.html", encoding='utf-8') as template_file:
+        return template_file.read()
+
+
+@functools.lru_cache(maxsize=4)
+def load_translated_template(language) -> str:
+    """
+    Return the email template with the translation placeholders of the given language already substituted.
+    Translations are static, so this is done once per language instead of once per newsletter.
+    """
+    return substitute_placeholders(load_template(), translation[language])
+
+
+def render_card(title, data, added_on, added_date, heading_suffix="", details="") -> str:
+    """
+    Build the HTML card of a new movie or TV show.
+    Title, description and poster come from the media server and TMDB, they are escaped here.
+    heading_suffix is appended to the title in the heading, details is inserted as-is after the description.
+    """
+    escaped_title = html.escape(title)
+    return MEDIA_CARD.format_map({
+        "poster": html.escape(data['poster']),
+        "title": escaped_title,
+        "heading": escaped_title + heading_suffix,
+        "added_on": added_on,
+        "added_date": added_date,
+        "description": html.escape(data['description']),
+        "details": details,
+        "rating": data['rating'] if data['rating'] != '0.0/10' else 'N/A',
+    })
+
 
 def populate_email_template(movies, series, total_tv, total_movie, total_movies_on_server, total_tv_on_server) -> str:
     include_overview = True
@@ -24,120 +100,63 @@ def populate_email_template(movies, series, total_tv, total_movie, total_movies_
         configuration.logging.info(
             "There are more than 10 new items, overview will not be included in the email template to avoid too much content.")
 
-    with open("./template/new_media_notification.html", encoding='utf-8') as template_file:
-        template = template_file.read()
-
-        if configuration.conf.email_template.language in ["en"]:
-            for key in translation[configuration.conf.email_template.language]:
-                template = re.sub(
-                    r"\${" + key + "}",
-                    translation[configuration.conf.email_template.language][key],
-                    template
-                )
+    # The language has been validated by check_configuration at startup
+    template = load_translated_template(configuration.conf.email_template.language)
+
+    # Labels used in the cards, looked up once rather than for every item
+    labels = translation[configuration.conf.email_template.language]
+    added_on = labels['added_on']
+    episode_label = labels['episode']
+    episodes_label = labels['episodes']
+
+    # Movies section
+    movies_parts = []
+    for movie_title, movie_data in movies.items():
+        added_date = movie_data["created_on"][:10] if movie_data["created_on"] else "Unknown"
+
+        movies_parts.append(render_card(movie_title, movie_data, added_on, added_date,
+                                        heading_suffix=f" ({movie_data['year']})"))
+
+    # TV Shows section
+    series_parts = []
+    for serie_title, serie_data in series.items():
+        added_date = serie_data["created_on"][:10] if serie_data["created_on"] != "undefined" else "Unknown"
+
+        # Format episode/season information
+        if len(serie_data["seasons"]) == 1:
+            if len(serie_data["episodes"]) == 1:
+                added_items_str = f"{serie_data['seasons'][0]}, {episode_label} {serie_data['episodes'][0]}"
+            else:
+                episodes_ranges = utils.summarize_ranges(serie_data["episodes"])
+                if len(episodes_ranges) == 1:
+                    added_items_str = f"{serie_data['seasons'][0]}, {episodes_label} {episodes_ranges[0]}"
+                else:
+                    added_items_str = f"{serie_data['seasons'][0]}, {episodes_label} {', '.join(episodes_ranges[:-1])} & {episodes_ranges[-1]}"
         else:
-            raise Exception(
-                f"[FATAL] Language {configuration.conf.email_template.language} not supported. Supported languages are en")
-
-        custom_keys = [
-            {"key": "title", "value": configuration.conf.email_template.title.format_map(context.placeholders)},
-            {"key": "subtitle", "value": configuration.conf.email_template.subtitle.format_map(context.placeholders)},
-            {"key": "server_url", "value": configuration.conf.email_template.server_url},
-            {"key": "server_owner_name",
-             "value": configuration.conf.email_template.server_owner_name.format_map(context.placeholders)},
-            {"key": "unsubscribe_email",
-             "value": configuration.conf.email_template.unsubscribe_email.format_map(context.placeholders)}
-        ]
-
+            serie_data["seasons"].sort()
+            added_items_str = ", ".join(serie_data["seasons"])
+
+        series_parts.append(render_card(serie_title, serie_data, added_on, added_date,
+                                        details=SERIES_DETAILS.format(added_items=html.escape(added_items_str))))
+
+    return substitute_placeholders(template, {
+        "title": configuration.conf.email_template.title.format_map(context.placeholders),
+        "subtitle": configuration.conf.email_template.subtitle.format_map(context.placeholders),
+        "server_url": configuration.conf.email_template.server_url,
+        "server_owner_name": configuration.conf.email_template.server_owner_name.format_map(context.placeholders),
+        "unsubscribe_email": configuration.conf.email_template.unsubscribe_email.format_map(context.placeholders),
         # Also support old variable names for backward compatibility
-        template = re.sub(r"\${jellyfin_url}", configuration.conf.email_template.server_url, template)
-        template = re.sub(r"\${jellyfin_owner_name}", configuration.conf.email_template.server_owner_name, template)
-
-        for key in custom_keys:
-            template = re.sub(r"\${" + key["key"] + "}", key["value"], template)
-
+        "jellyfin_url": configuration.conf.email_template.server_url,
+        "jellyfin_owner_name": configuration.conf.email_template.server_owner_name,
         # Movies section
-        if movies:
-            template = re.sub(r"\${display_movies}", "", template)
-            movies_html = ""
-
-            for movie_title, movie_data in movies.items():
-                added_date = movie_data["created_on"].split("T")[0] if movie_data["created_on"] else "Unknown"
-
-                movies_html += f"""
-                <div class="media-item">
-                    <!--[if mso]><table role="presentation" border="0" cellpadding="0" cellspacing="0" width="100%"><tr><td width="25%" valign="top"><![endif]-->
-                    <div class="column">
-                        <img src="{movie_data['poster']}" alt="{movie_title}" style="width: 100%; height: auto; display: block; margin: 0 auto;" />
-                    </div>
-                    <!--[if mso]></td><td width="70%" valign="top"><![endif]-->
-                    <div class="column content">
-                        <div class="media-content">
-                            <h3 class="media-title">{movie_title} ({movie_data['year']})</h3>
-                            <div class="media-meta">{translation[configuration.conf.email_template.language]['added_on']} {added_date}</div>
-                            <p class="media-description">{movie_data['description']}</p>
-                            <p class="media-rating">Rating: {movie_data['rating'] if movie_data['rating'] != '0.0/10' else 'N/A'}</p>
-                        </div>
-                    </div>
-                    <!--[if mso]></td></tr></table><![endif]-->
-                </div>
-                """
-
-            template = re.sub(r"\${films}", movies_html, template)
-        else:
-            template = re.sub(r"\${display_movies}", "display:none", template)
-
+        "display_movies": "" if movies else "display:none",
+        "films": "".join(movies_parts),
         # TV Shows section
-        if series:
-            template = re.sub(r"\${display_tv}", "", template)
-            series_html = ""
-
-            for serie_title, serie_data in series.items():
-                added_date = serie_data["created_on"].split("T")[0] if serie_data[
-                                                                           "created_on"] != "undefined" else "Unknown"
-
-                # Format episode/season information
-                if len(serie_data["seasons"]) == 1:
-                    if len(serie_data["episodes"]) == 1:
-                        added_items_str = f"{serie_data['seasons'][0]}, {translation[configuration.conf.email_template.language]['episode']} {serie_data['episodes'][0]}"
-                    else:
-                        episodes_ranges = utils.summarize_ranges(serie_data["episodes"])
-                        if len(episodes_ranges) == 1:
-                            added_items_str = f"{serie_data['seasons'][0]}, {translation[configuration.conf.email_template.language]['episodes']} {episodes_ranges[0]}"
-                        else:
-                            added_items_str = f"{serie_data['seasons'][0]}, {translation[configuration.conf.email_template.language]['episodes']} {', '.join(episodes_ranges[:-1])} & {episodes_ranges[-1]}"
-                else:
-                    serie_data["seasons"].sort()
-                    added_items_str = ", ".join(serie_data["seasons"])
-
-                series_html += f"""
-                <div class="media-item">
-                    <!--[if mso]><table role="presentation" border="0" cellpadding="0" cellspacing="0" width="100%"><tr><td width="25%" valign="top"><![endif]-->
-                    <div class="column">
-                        <img src="{serie_data['poster']}" alt="{serie_title}" style="width: 100%; height: auto; display: block; margin: 0 auto;" />
-                    </div>
-                    <!--[if mso]></td><td width="70%" valign="top"><![endif]-->
-                    <div class="column content">
-                        <div class="media-content">
-                            <h3 class="media-title">{serie_title}</h3>
-                            <div class="media-meta">{translation[configuration.conf.email_template.language]['added_on']} {added_date}</div>
-                            <p class="media-description">{serie_data['description']}</p>
-                            <div class="media-meta">{added_items_str}</div>
-                            <br>
-                            <p class="media-rating">Rating: {serie_data['rating'] if serie_data['rating'] != '0.0/10' else 'N/A'}</p>
-                        </div>
-                    </div>
-                    <!--[if mso]></td></tr></table><![endif]-->
-                </div>
-                """
-
-            template = re.sub(r"\${tvs}", series_html, template)
-        else:
-            template = re.sub(r"\${display_tv}", "display:none", template)
-
+        "display_tv": "" if series else "display:none",
+        "tvs": "".join(series_parts),
         # Statistics section
-        template = re.sub(r'\${series_count}', str(total_tv), template)
-        template = re.sub(r'\${movies_count}', str(total_movie), template)
-        template = re.sub(r'\${total_movies_on_server}', str(total_movies_on_server), template)
-        template = re.sub(r'\${total_tv_on_server}', str(total_tv_on_server), template)
-
-        return template
\ No newline at end of file
+        "series_count": str(total_tv),
+        "movies_count": str(total_movie),
+        "total_movies_on_server": str(total_movies_on_server),
+        "total_tv_on_server": str(total_tv_on_server),
+    })
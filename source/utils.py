@@ -1,3 +1,10 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Number of worker threads used to send independent requests concurrently (TMDB lookups, server statistics)
+MAX_CONCURRENT_REQUESTS = 4
+
 def summarize_ranges(nums):
     """
     Summarizes a list of integers into ranges.
@@ -27,4 +34,21 @@ def summarize_ranges(nums):
     else:
         result.append(f"{start}-{end}")
 
-    return result
\ No newline at end of file
+    return result
+
+
+def create_http_session():
+    """
+    Create a requests session keeping connections alive between requests, so each call to the same host does not open
+    a new TCP/TLS connection.
+    Requests failing with a temporary server error (502, 503, 504) are retried twice. If they still fail, the last
+    response is returned so the caller can handle the status code as usual.
+    The pool keeps one connection per worker thread, plus one for the main thread which may send requests on the same
+    session while workers are running (e.g. server statistics fetched in the background).
+    """
+    retry = Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=MAX_CONCURRENT_REQUESTS + 1)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session